@@ -1,7 +1,12 @@
-import datetime
+import collections
+import logging
 import os
 import pathlib
 import tempfile
+import time
+import weakref
+import zlib
+from typing import IO
 from typing import Any
 from typing import Callable
 from typing import Optional
@@ -16,6 +21,18 @@ from compas.scene import Scene
 
 from .settings import Settings
 
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _compress(obj: Any) -> bytes:
+    return zlib.compress(compas.json_dumps(obj).encode("utf-8"), 1)
+
+
+def _decompress(blob: bytes) -> Any:
+    return compas.json_loads(zlib.decompress(blob).decode("utf-8"))
+
 
 class SessionError(Exception):
     pass
@@ -35,6 +52,12 @@ class Session:
     basedir : str or Path-like, optional
         A "working" directory that serves as the root
         for storing (temporary) session data.
+    persistent : bool, optional
+        If True (default), the session is kept alive for the lifetime of the program.
+        If False, the session is released as soon as no other references to it remain,
+        and a new call with the same name creates a new session.
+        The flag only applies when the session is first created;
+        it is ignored when a session with the same name already exists.
 
     Raises
     ------
@@ -43,17 +66,37 @@ class Session:
 
     """
 
-    _instances = {}
-    _is_inited = False
-
-    def __new__(cls, *, name: str, **kwargs):
+    __slots__ = (
+        "name",
+        "data",
+        "scene",
+        "settings",
+        "current",
+        "depth",
+        "history",
+        "timestamp",
+        "_basedir",
+        "_tempdir",
+        "_filepath",
+        "_is_inited",
+        "__weakref__",
+    )
+
+    _instances = weakref.WeakValueDictionary()
+    _persistent = set()
+
+    def __new__(cls, *, name: str, persistent: bool = True, **kwargs):
+        instance = cls._instances.get(name)
+        if instance is not None:
+            return instance
         if not name:
             raise SessionError("A session name is required.")
-        if name not in cls._instances:
-            instance = object.__new__(cls)
-            instance._is_inited = False
-            cls._instances[name] = instance
-        return cls._instances[name]
+        instance = object.__new__(cls)
+        instance._is_inited = False
+        cls._instances[name] = instance
+        if persistent:
+            cls._persistent.add(instance)
+        return instance
 
     def __init__(
         self,
@@ -62,6 +105,7 @@ class Session:
         basedir: Optional[Union[str, pathlib.Path]] = None,
         scene: Scene = None,
         settings: Settings = None,
+        persistent: bool = True,
     ) -> None:
         if not self._is_inited:
             self.name = name
@@ -70,17 +114,28 @@ class Session:
             self.settings = settings or Settings()
             self.current = -1
             self.depth = 53
-            self.history = []
-            self.timestamp = int(datetime.datetime.timestamp(datetime.datetime.now()))
+            self.history = collections.deque(maxlen=self.depth)
+            self.timestamp = int(time.time())
             self.basedir = basedir
         self._is_inited = True
 
+    @property
+    def basedir(self):
+        return self._basedir
+
+    @basedir.setter
+    def basedir(self, basedir):
+        self._basedir = basedir
+        self._tempdir = None
+        self._filepath = pathlib.Path(basedir) / f"{self.name}.json" if basedir else None
+
     @property
     def tempdir(self):
-        if self.basedir:
+        if self._tempdir is None and self.basedir:
             tempdir = pathlib.Path(self.basedir) / "temp"
             tempdir.mkdir(exist_ok=True)
-            return tempdir
+            self._tempdir = tempdir
+        return self._tempdir
 
     def __contains__(self, key):
         return key in self.data
@@ -108,9 +163,7 @@ class Session:
             or the default value if no entry with the given key/identifier exists.
 
         """
-        if key not in self.data:
-            return default
-        return self.data[key]
+        return self.data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         """Insert `key` in the session, and assign `value` to it.
@@ -145,51 +198,88 @@ class Session:
         Any
 
         """
-        if key not in self.data:
-            self.set(key, factory())
-        return self.get(key)
+        value = self.data.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.data[key] = value
+        return value
 
-    def load(self, filepath: Union[str, pathlib.Path], reset: bool = True) -> None:
+    def load(self, filepath: Optional[Union[str, pathlib.Path, IO[str]]] = None, reset: bool = True, validate: bool = True) -> None:
         """Replace the session data with the data of a session stored in a file.
 
         Parameters
         ----------
-        filepath : str | Path
+        filepath : str | Path | file-like, optional
             Location of the file containing the session data.
+            Defaults to a file named after the session in :attr:`basedir`.
+        reset : bool, optional
+            If True, reset the session history before loading.
+        validate : bool, optional
+            If True (default), validate the stored settings.
+            Only disable validation for files written by :meth:`dump` with settings that have no nested model fields,
+            since nested models are otherwise restored as plain dicts.
 
         Returns
         -------
         None
 
+        Raises
+        ------
+        SessionError
+            If no filepath is provided and the session has no basedir.
+
         """
+        if filepath is None:
+            filepath = self._default_filepath()
         if reset:
             self.reset()
         session = compas.json_load(filepath)
-        self.data = session["data"]
-        self.scene = session["scene"]
-        self.settings = self.settings.__class__(**session["settings"])
-
-    def dump(self, filepath: Union[str, pathlib.Path]) -> None:
+        settingsclass = self.settings.__class__
+        if validate:
+            session["settings"] = settingsclass(**session["settings"])
+        else:
+            session["settings"] = settingsclass.model_construct(**session["settings"])
+        self._restore(session)
+
+    def dump(self, filepath: Optional[Union[str, pathlib.Path, IO[str]]] = None) -> None:
         """Dump the data of the current session into a file.
 
+        If `filepath` is a path, the data is written to a uniquely named temporary file next to it first,
+        which then replaces `filepath`,
+        such that an interrupted dump never leaves a partially written session file.
+        File-like objects are written to directly.
+
         Parameters
         ----------
-        filepath : str | Path
+        filepath : str | Path | file-like, optional
             Location of the file containing the session data.
+            Defaults to a file named after the session in :attr:`basedir`.
 
         Returns
         -------
         None
 
+        Raises
+        ------
+        SessionError
+            If no filepath is provided and the session has no basedir.
+
         """
-        compas.json_dump(
-            {
-                "data": self.data,
-                "scene": self.scene,
-                "settings": self.settings.model_dump(),
-            },
-            filepath,
-        )
+        if filepath is None:
+            filepath = self._default_filepath()
+        if not isinstance(filepath, (str, os.PathLike)):
+            filepath.write(self._dumps())
+            return
+        filepath = pathlib.Path(filepath)
+        text = self._dumps()
+        fd, temppath = tempfile.mkstemp(dir=filepath.parent, prefix=filepath.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(text.encode("utf-8"))
+            os.replace(temppath, filepath)
+        except BaseException:
+            pathlib.Path(temppath).unlink(missing_ok=True)
+            raise
 
     def undo(self) -> bool:
         """Move one step backward in recorded session history.
@@ -207,17 +297,17 @@ class Session:
 
         """
         if self.current < 0:
-            print("Nothing to undo!")
+            log.debug("Nothing to undo!")
             return False
 
         if self.current == 0:
-            print("Nothing more to undo!")
+            log.debug("Nothing more to undo!")
             return False
 
         self.current -= 1
-        filepath, _ = self.history[self.current]
+        state, _ = self.history[self.current]
 
-        self.load(filepath, reset=False)
+        self._restore(self._thaw(state))
         return True
 
     def redo(self) -> bool:
@@ -236,18 +326,23 @@ class Session:
 
         """
         if self.current == len(self.history) - 1:
-            print("Nothing more to redo!")
+            log.debug("Nothing more to redo!")
             return False
 
         self.current += 1
-        filepath, _ = self.history[self.current]
+        state, _ = self.history[self.current]
 
-        self.load(filepath, reset=False)
+        self._restore(self._thaw(state))
         return True
 
     def record(self, name: str) -> None:
         """Record the current state of the session into session history.
 
+        The state is serialized, compressed, and kept in memory.
+        Recording a state therefore never touches the disk.
+        Data values and the scene are serialized separately,
+        and values that did not change since the previous state share the serialized data of that state.
+
         Parameters
         ----------
         name : str
@@ -258,18 +353,13 @@ class Session:
         None
 
         """
-        if self.current > -1:
-            if self.current < len(self.history) - 1:
-                self.history[:] = self.history[: self.current + 1]
+        while len(self.history) > self.current + 1:
+            self.history.pop()
 
-        _, filepath = tempfile.mkstemp(dir=self.tempdir, suffix=".json", text=True)
+        if self.history.maxlen != self.depth:
+            self.history = collections.deque(self.history, maxlen=self.depth)
 
-        self.dump(filepath)
-        self.history.append((filepath, name))
-
-        h = len(self.history)
-        if h > self.depth:
-            self.history[:] = self.history[h - self.depth :]
+        self.history.append((self._freeze(), name))
         self.current = len(self.history) - 1
 
     def reset(self) -> None:
@@ -282,11 +372,45 @@ class Session:
         """
         self.current = -1
         self.depth = 53
-        for filepath, eventname in self.history:
-            try:
-                os.unlink(filepath)
-            except PermissionError:
-                pass
-            except Exception:
-                pass
-        self.history = []
+        self.history = collections.deque(maxlen=self.depth)
+
+    def _default_filepath(self) -> pathlib.Path:
+        if self._filepath is None:
+            raise SessionError("A filepath is required if the session has no basedir.")
+        return self._filepath
+
+    def _dumps(self) -> str:
+        return compas.json_dumps(
+            {
+                "data": self.data,
+                "scene": self.scene,
+                "settings": self.settings.model_dump(),
+            }
+        )
+
+    def _freeze(self) -> dict:
+        previous = self.history[-1][0] if self.history else {"data": {}, "scene": None}
+        data = {}
+        for key, value in self.data.items():
+            blob = _compress(value)
+            if blob == previous["data"].get(key):
+                blob = previous["data"][key]
+            data[key] = blob
+        scene = _compress(self.scene)
+        if scene == previous["scene"]:
+            scene = previous["scene"]
+        return {"data": data, "scene": scene, "settings": self.settings.model_copy(deep=True)}
+
+    @staticmethod
+    def _thaw(state: dict) -> dict:
+        return {
+            "data": {key: _decompress(blob) for key, blob in state["data"].items()},
+            "scene": _decompress(state["scene"]),
+            "settings": state["settings"].model_copy(deep=True),
+        }
+
+    def _restore(self, session: dict) -> None:
+        self.data.clear()
+        self.data.update(session["data"])
+        self.scene = session["scene"]
+        self.settings = session["settings"]
@@ -1,6 +1,12 @@
+import io
+
+import compas
+import pydantic
 import pytest
+from compas.scene import Scene
 
 from compas_session.session import Session, SessionError
+from compas_session.settings import Settings
 
 
 def test_session_noname():
@@ -56,3 +62,267 @@ def test_session_settings_values():
 
     assert session1.settings.autosave is False
     assert session2.settings.autosave is True
+
+
+def test_session_tempdir(tmp_path):
+    session = Session(name="Temp", basedir=tmp_path)
+
+    tempdir = session.tempdir
+    assert tempdir == tmp_path / "temp"
+    assert tempdir.is_dir()
+    assert session.tempdir is tempdir
+
+    session.basedir = tmp_path / "other"
+    session.basedir.mkdir()
+    assert session.tempdir == tmp_path / "other" / "temp"
+    assert session.tempdir.is_dir()
+
+
+def test_session_persistent():
+    session = Session(name="Persistent")
+    session["a"] = 1
+    del session
+
+    assert Session(name="Persistent")["a"] == 1
+
+
+def test_session_not_persistent():
+    session = Session(name="Transient", persistent=False)
+    session["a"] = 1
+    assert Session(name="Transient", persistent=True) is session
+
+    del session
+
+    assert "a" not in Session(name="Transient", persistent=False)
+
+
+def test_session_setdefault():
+    session = Session(name="Default")
+
+    value = session.setdefault("a", list)
+    assert value == []
+    assert session["a"] is value
+
+    assert session.setdefault("a", dict) is value
+
+
+def test_session_dump_load(tmp_path):
+    session = Session(name="Dump")
+    session["a"] = [1, 2, 3]
+    session.settings.autosave = False
+
+    filepath = tmp_path / "session.json"
+    session.dump(filepath)
+    assert filepath.exists()
+    assert list(tmp_path.iterdir()) == [filepath]
+
+    session["a"] = None
+    session.settings.autosave = True
+    session.load(filepath)
+    assert session["a"] == [1, 2, 3]
+    assert session.settings.autosave is False
+
+
+def test_session_dump_load_fileobject():
+    session = Session(name="FileObject")
+    session["a"] = [1, 2, 3]
+
+    stream = io.StringIO()
+    session.dump(stream)
+
+    session["a"] = None
+    stream.seek(0)
+    session.load(stream)
+    assert session["a"] == [1, 2, 3]
+
+
+def test_session_dump_keeps_tmp_sibling(tmp_path):
+    session = Session(name="TmpSibling")
+
+    filepath = tmp_path / "session.json"
+    sibling = tmp_path / "session.json.tmp"
+    sibling.write_text("user data")
+
+    session.dump(filepath)
+
+    assert sibling.read_text() == "user data"
+    assert sorted(tmp_path.iterdir()) == [filepath, sibling]
+
+
+def test_session_dump_failure(tmp_path, monkeypatch):
+    session = Session(name="DumpFailure")
+    session["a"] = 1
+
+    def replace(src, dst):
+        raise OSError("Target is locked.")
+
+    monkeypatch.setattr("compas_session.session.os.replace", replace)
+
+    filepath = tmp_path / "session.json"
+    with pytest.raises(OSError):
+        session.dump(filepath)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_session_history(tmp_path):
+    session = Session(name="History", basedir=tmp_path)
+    session.depth = 3
+
+    for i in range(5):
+        session["i"] = i
+        session.record(f"Step {i}")
+
+    assert [name for _, name in session.history] == ["Step 2", "Step 3", "Step 4"]
+    assert session.current == 2
+
+    assert session.undo()
+    assert session.undo()
+    assert not session.undo()
+    assert session["i"] == 2
+
+    session["i"] = 10
+    session.record("Branch")
+
+    assert [name for _, name in session.history] == ["Step 2", "Branch"]
+    assert session.current == 1
+    assert not session.redo()
+
+    assert session.undo()
+    assert session["i"] == 2
+    assert session.redo()
+    assert session["i"] == 10
+
+
+def test_session_history_inplace_edit():
+    session = Session(name="InPlace")
+    session["points"] = [[0, 0, 0]]
+    session.record("Init")
+
+    session["points"].append([1, 0, 0])
+    session.record("Append")
+
+    session["points"].append([2, 0, 0])
+
+    assert session.undo()
+    assert session["points"] == [[0, 0, 0]]
+    assert session.redo()
+    assert session["points"] == [[0, 0, 0], [1, 0, 0]]
+
+
+def test_session_history_shared_values():
+    session = Session(name="Shared")
+    session["a"] = list(range(100))
+    session["b"] = 0
+    session.record("First")
+
+    session["b"] = 1
+    session.record("Second")
+
+    first, _ = session.history[0]
+    second, _ = session.history[1]
+    assert second["data"]["a"] is first["data"]["a"]
+    assert second["data"]["b"] is not first["data"]["b"]
+    assert second["scene"] is first["scene"]
+
+    assert session.undo()
+    assert session["b"] == 0
+    assert session["a"] == list(range(100))
+
+
+def test_session_setdefault_none():
+    session = Session(name="DefaultNone")
+    session["a"] = None
+
+    assert session.setdefault("a", list) is None
+
+
+def test_session_load_validate(tmp_path):
+    filepath = tmp_path / "session.json"
+    compas.json_dump({"data": {}, "scene": Scene(), "settings": {"autosave": "maybe"}}, filepath)
+
+    session = Session(name="Validate")
+    with pytest.raises(pydantic.ValidationError):
+        session.load(filepath, validate=True)
+
+
+class NestedSettings(pydantic.BaseModel):
+    x: int = 0
+
+
+class CustomSettings(Settings):
+    sub: NestedSettings = NestedSettings()
+    layers: list = []
+
+
+def test_session_settings_subclass_roundtrip(tmp_path):
+    session = Session(name="CustomSettings", settings=CustomSettings())
+    session.settings.sub.x = 1
+    session.record("First")
+    session.settings.sub.x = 2
+    session.record("Second")
+
+    assert session.undo()
+    assert isinstance(session.settings.sub, NestedSettings)
+    assert session.settings.sub.x == 1
+
+    session.settings.layers.append("ZZZ")
+    assert session.redo()
+    assert session.undo()
+    assert session.settings.layers == []
+
+    filepath = tmp_path / "session.json"
+    session.dump(filepath)
+    session.load(filepath)
+    assert isinstance(session.settings, CustomSettings)
+    assert isinstance(session.settings.sub, NestedSettings)
+    assert session.settings.sub.x == 1
+
+
+def test_session_load_no_validate(tmp_path):
+    session = Session(name="NoValidate", settings=CustomSettings())
+    session.settings.sub.x = 1
+
+    filepath = tmp_path / "session.json"
+    session.dump(filepath)
+    session.load(filepath, validate=False)
+
+    assert isinstance(session.settings, CustomSettings)
+    assert session.settings.sub == {"x": 1}
+
+
+def test_session_history_data_identity():
+    session = Session(name="Identity")
+    data = session.data
+
+    session["a"] = 1
+    session.record("First")
+    session["a"] = 2
+    session.record("Second")
+
+    assert session.undo()
+    assert session.data is data
+    assert data["a"] == 1
+
+
+def test_session_dump_load_default(tmp_path):
+    session = Session(name="DefaultPath", basedir=tmp_path)
+    session["a"] = 1
+    session.dump()
+    assert (tmp_path / "DefaultPath.json").exists()
+
+    session["a"] = 2
+    session.load()
+    assert session["a"] == 1
+
+    session.basedir = None
+    with pytest.raises(SessionError):
+        session.dump()
+
+
+def test_session_undo_empty(capsys):
+    session = Session(name="Empty")
+
+    assert not session.undo()
+    assert not session.redo()
+    assert capsys.readouterr().out == ""